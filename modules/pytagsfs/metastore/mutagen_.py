@@ -170,8 +170,11 @@ class _BaseMutagenMetaStore(MetaStore):
         return self.extract(tags)
 
     def set(self, path, values):
+        # All of the values are applied to the in-memory tags object and
+        # written back with a single save, so the file is opened, parsed and
+        # rewritten once regardless of how many values change.
         tags = self.make_tags_obj(path)
-        log_info(u'set: values=%s', unicode(values))
+        log_info(u'set: values=%s', values)
         self.inject(tags, values)
         log_info(u'set: tags=%s', unicode(dict(tags)))
         tags.save()
@@ -184,7 +187,7 @@ class _BaseMutagenMetaStore(MetaStore):
         for field in tags:
             tag = tags[field]
             try:
-                values[field] = cls.get_value_from_tag(field, tags[field])
+                values[field] = cls.get_value_from_tag(field, tag)
             except ValueError:
                 pass
 
@@ -218,13 +221,16 @@ class _BaseMutagenMetaStore(MetaStore):
     @classmethod
     def post_process(cls, values):
         if 'n' in values:
+            # Parse each track number only once; both the plain and the
+            # zero-padded forms are formatted from the parsed integers.
             try:
-                values['n'] = ['%u' % int(v) for v in values['n']]
+                track_numbers = [int(v) for v in values['n']]
             except ValueError:
                 del values['n']
             else:
+                values['n'] = ['%u' % n for n in track_numbers]
                 values['TRACKNUMBER'] = values['N'] = [
-                  '%02u' % int(v) for v in values['n']]
+                  '%02u' % n for n in track_numbers]
 
     @classmethod
     def inject(cls, tags, values):
@@ -256,6 +256,16 @@ class PathStore(object):
         '''
         raise NotImplementedError
 
+    def iter_real_subpaths(self, real_path):
+        '''
+        Like ``get_real_subpaths``, but return an iterator rather than a list.
+        The path store must not be modified while the iterator is in use.
+        The default implementation simply iterates over the result of
+        ``get_real_subpaths``; sub-classes may override it to avoid building
+        the list.
+        '''
+        return iter(self.get_real_subpaths(real_path))
+
     def set_meta_data(self, fake_path, meta_data):
         '''
         Store ``meta_data`` for ``fake_path``.  Raise ``PathNotFound`` if
@@ -296,15 +306,25 @@ class PathStore(object):
 ################################################################################
 
     def get_end_points(self, fake_path):
-        if self.is_file(fake_path):
-            return [fake_path]
-
-        entries = self.get_entries(fake_path)
-        if entries == []:
-            return [fake_path]
-
+        # Depth-first traversal using an explicit stack rather than recursion.
+        # Entries are pushed in reverse order so that end points are returned
+        # in the same order that get_entries lists them.
         end_points = []
-        for entry in entries:
-            entry_path = join_path_abs([fake_path, entry])
-            end_points.extend(self.get_end_points(entry_path))
+        stack = [fake_path]
+        while stack:
+            fake_path = stack.pop()
+
+            if self.is_file(fake_path):
+                end_points.append(fake_path)
+                continue
+
+            entries = self.get_entries(fake_path)
+            if not entries:
+                end_points.append(fake_path)
+                continue
+
+            entries.reverse()
+            stack.extend([
+              join_path_abs([fake_path, entry]) for entry in entries
+            ])
         return end_points
@@ -107,30 +107,26 @@ class PathMapping(object):
         except KeyError:
             raise PathDoesNotExistInPathMapping(real_path)
 
+    def has_fake_path(self, fake_path):
+        # Empty lists are always cleaned out of the forward mapping, so a
+        # simple membership test is sufficient.
+        return fake_path in self.forward_mapping
+
     def get_reverse_keys(self):
         return self.reverse_mapping.keys()
 
+    def iter_reverse_keys(self):
+        return self.reverse_mapping.iterkeys()
 
-class Entry(unicode):
-    def __init__(self, s):
-        if not isinstance(s, unicode):
-            raise TypeError(u'must be unicode: %s' % repr(s))
-        super(Entry, self).__init__()
 
-    def set_meta_data(self, meta_data):
-        self.meta_data = meta_data
+def _assert_unicode(entry):
+    if not isinstance(entry, unicode):
+        raise TypeError(u'must be unicode: %s' % repr(entry))
 
-    def get_meta_data(self):
-        try:
-            return self.meta_data
-        except AttributeError:
-            raise NoMetaDataExists(self)
 
-    def unset_meta_data(self):
-        try:
-            del self.meta_data
-        except AttributeError:
-            raise NoMetaDataExists(self)
+# Placeholder stored in EntryStore.meta_data for entries without meta-data.
+# None cannot be used because it is a valid meta-data value.
+_NO_META_DATA = object()
 
 
 class DirectoryAlreadyExistsInEntryStore(PathError):
@@ -146,29 +142,43 @@ class EntryDoesNotExistInEntryStore(PathError):
 
 
 class EntryStore(object):
+    # Entry names and their meta-data are kept in separate, index-aligned
+    # lists (one pair per directory), so that listing a directory or locating
+    # an entry never has to touch meta-data.
     entries = None
+    meta_data = None
 
     def __init__(self):
         self.entries = {}
+        self.meta_data = {}
         self.add_directory(unicode_path_sep)
 
     def add_directory(self, directory):
         if directory in self.entries:
             raise DirectoryAlreadyExistsInEntryStore(directory)
         self.entries[directory] = []
+        self.meta_data[directory] = []
 
     def remove_directory(self, directory):
         if directory == unicode_path_sep:
             raise ValueError(unicode_path_sep)
         del self.entries[directory]
+        del self.meta_data[directory]
+
+    def has_directory(self, directory):
+        return directory in self.entries
+
+    def is_empty_directory(self, directory):
+        entries = self.entries.get(directory)
+        return entries is not None and not entries
 
     def add_entry(self, directory, entry):
-        if not isinstance(entry, Entry):
-            entry = Entry(entry)
+        _assert_unicode(entry)
         try:
             self.entries[directory].append(entry)
         except KeyError:
             raise DirectoryDoesNotExistInEntryStore(directory)
+        self.meta_data[directory].append(_NO_META_DATA)
 
     def add_entries(self, directory, entries):
         for entry in entries:
@@ -177,6 +187,7 @@ class EntryStore(object):
     def remove_entry(self, directory, entry):
         directory, index = self._locate_entry(directory, entry)
         del self.entries[directory][index]
+        del self.meta_data[directory][index]
 
     def get_all_entries(self, directory):
         try:
@@ -187,9 +198,22 @@ class EntryStore(object):
     def get_entries(self, directory):
         return last_unique(self.get_all_entries(directory))
 
-    def get_entry(self, fake_path):
+    def set_meta_data(self, fake_path, meta_data):
+        directory, index = self._locate_entry_by_fake_path(fake_path)
+        self.meta_data[directory][index] = meta_data
+
+    def get_meta_data(self, fake_path):
+        directory, index = self._locate_entry_by_fake_path(fake_path)
+        meta_data = self.meta_data[directory][index]
+        if meta_data is _NO_META_DATA:
+            raise NoMetaDataExists(fake_path)
+        return meta_data
+
+    def unset_meta_data(self, fake_path):
         directory, index = self._locate_entry_by_fake_path(fake_path)
-        return self.get_all_entries(directory)[index]
+        if self.meta_data[directory][index] is _NO_META_DATA:
+            raise NoMetaDataExists(fake_path)
+        self.meta_data[directory][index] = _NO_META_DATA
 
     def _locate_entry_by_fake_path(self, fake_path):
         if fake_path.endswith(unicode_path_sep):
@@ -198,35 +222,46 @@ class EntryStore(object):
         return self._locate_entry(directory, entry)
 
     def _locate_entry(self, directory, entry):
-        reversed_entries = list(reversed(self.get_all_entries(directory)))
-        try:
-            reverse_index = reversed_entries.index(entry)
-        except IndexError:
-            raise EntryDoesNotExistInEntryStore(entry)
-        index = len(reversed_entries) - reverse_index - 1
-        return directory, index
+        # Search backwards from the end of the list, in place, so that the most
+        # recently added entry is found without copying the list.
+        entries = self.get_all_entries(directory)
+        index = len(entries) - 1
+        while index >= 0:
+            if entries[index] == entry:
+                return directory, index
+            index = index - 1
+        raise EntryDoesNotExistInEntryStore(entry)
 
     def replace_entry(self, directory, entry, new_entry):
-        if not isinstance(new_entry, Entry):
-            new_entry = Entry(new_entry)
+        _assert_unicode(new_entry)
         directory, index = self._locate_entry(directory, entry)
         self.entries[directory][index] = new_entry
+        self.meta_data[directory][index] = _NO_META_DATA
 
-    def iter_directories_and_entries_recursive_reversed(self, fake_path):
+    def iter_directories_and_entries_recursive(self, fake_path):
+        if not fake_path.startswith(unicode_path_sep):
+            raise ValueError(fake_path)
         if fake_path.endswith(unicode_path_sep):
             raise ValueError(fake_path)
 
+        # Scan the path for separators once, slicing each directory and entry
+        # out of the original string, rather than calling os.path.split once
+        # per level.  Fake paths are absolute and normalized, so there are no
+        # repeated separators to worry about.
+        directory = unicode_path_sep
+        start = len(unicode_path_sep)
         while True:
-            fake_path, entry = os.path.split(fake_path)
-            if not entry:
+            end = fake_path.find(unicode_path_sep, start)
+            if end == -1:
+                yield directory, fake_path[start:]
                 break
-            yield fake_path, entry
+            yield directory, fake_path[start:end]
+            directory = fake_path[:end]
+            start = end + len(unicode_path_sep)
 
-    def iter_directories_and_entries_recursive(self, fake_path):
-        for fake_path, entry in reversed(list(
-          self.iter_directories_and_entries_recursive_reversed(fake_path)
-        )):
-            yield fake_path, entry
+    def iter_directories_and_entries_recursive_reversed(self, fake_path):
+        return reversed(list(
+          self.iter_directories_and_entries_recursive(fake_path)))
 
     def add_entries_and_directories_recursive(self, fake_path):
         for fake_path, entry in (
@@ -266,13 +301,11 @@ class PyTypesPathStore(PathStore):
 
     path_mapping = None
     entries = None
-    meta_data = None
 
     def __init__(self):
         super(PyTypesPathStore, self).__init__()
         self.path_mapping = PathMapping()
         self.entries = EntryStore()
-        self.meta_data = {}
 
     def _assert_not_root(self, path):
         if path == unicode_path_sep:
@@ -391,36 +424,36 @@ class PyTypesPathStore(PathStore):
             raise RealPathNotFound(real_path)
 
     def get_real_subpaths(self, real_path):
+        return list(self.iter_real_subpaths(real_path))
+
+    def iter_real_subpaths(self, real_path):
         if real_path.endswith(unicode_path_sep):
             raise ValueError(u'real_path %s ends with %s' % (
               repr(real_path), repr(unicode_path_sep)))
-        real_path = u'%s%s' % (real_path, unicode_path_sep)
-        real_paths = self.path_mapping.get_reverse_keys()
-        return [p for p in real_paths if p.startswith(real_path)]
+        return self._iter_real_subpaths(
+          u'%s%s' % (real_path, unicode_path_sep))
+
+    def _iter_real_subpaths(self, prefix):
+        for p in self.path_mapping.iter_reverse_keys():
+            if p.startswith(prefix):
+                yield p
 
     def get_entries(self, fake_path):
-        self._must_be_dir(fake_path)
-        return list(self.entries.get_entries(fake_path))
+        try:
+            return self.entries.get_entries(fake_path)
+        except DirectoryDoesNotExistInEntryStore:
+            # Not a directory; raise the appropriate error.
+            self._must_be_dir(fake_path)
+            raise
 
     def is_file(self, fake_path):
-        try:
-            self.path_mapping.get_real_path(fake_path)
-        except PathDoesNotExistInPathMapping:
-            return False
-        return True
+        return self.path_mapping.has_fake_path(fake_path)
 
     def is_dir(self, fake_path):
-        try:
-            self.entries.get_entries(fake_path)
-        except DirectoryDoesNotExistInEntryStore:
-            return False
-        return True
+        return self.entries.has_directory(fake_path)
 
     def is_empty_dir(self, fake_path):
-        return (
-          self.is_dir(fake_path) and
-          not self.entries.get_all_entries(fake_path)
-        )
+        return self.entries.is_empty_directory(fake_path)
 
     def path_exists(self, fake_path):
         if self.is_file(fake_path):
@@ -437,46 +470,49 @@ class PyTypesPathStore(PathStore):
         if self.path_exists(fake_path):
             raise PathExists(fake_path)
 
+    # The _must_be_* checks test for the expected case first, so that paths
+    # that pass only cost the lookups needed to answer that one question.
+    # Existence is only checked afterwards, to choose which error to raise.
+
     def _must_be_file(self, fake_path):
+        if self.is_file(fake_path):
+            return
         self._must_exist(fake_path)
-        if not self.is_file(fake_path):
-            raise IsADirectory(fake_path)
+        raise IsADirectory(fake_path)
 
     def _must_be_dir(self, fake_path):
+        if self.is_dir(fake_path):
+            return
         self._must_exist(fake_path)
-        if not self.is_dir(fake_path):
-            raise NotADirectory(fake_path)
+        raise NotADirectory(fake_path)
 
     def _must_be_empty_directory(self, fake_path):
-        self._must_exist(fake_path)
         if self.is_empty_dir(fake_path):
             return
+        self._must_exist(fake_path)
         if self.is_file(fake_path):
             raise NotADirectory(fake_path)
         raise NotAnEndPoint(fake_path)
 
     def _must_be_end_point(self, fake_path):
-        self._must_exist(fake_path)
         if self.is_file(fake_path):
             return
         if self.is_empty_dir(fake_path):
             return
+        self._must_exist(fake_path)
         raise NotAnEndPoint(fake_path)
 
     def set_meta_data(self, fake_path, meta_data):
         self._must_be_end_point(fake_path)
-        entry = self.entries.get_entry(fake_path)
-        entry.set_meta_data(meta_data)
+        self.entries.set_meta_data(fake_path, meta_data)
 
     def get_meta_data(self, fake_path):
         self._must_be_end_point(fake_path)
-        entry = self.entries.get_entry(fake_path)
-        return entry.get_meta_data()
+        return self.entries.get_meta_data(fake_path)
 
     def unset_meta_data(self, fake_path):
         self._must_be_end_point(fake_path)
-        entry = self.entries.get_entry(fake_path)
-        entry.unset_meta_data()
+        self.entries.unset_meta_data(fake_path)
 
     def supports_threads(self):
         return True
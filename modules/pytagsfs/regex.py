@@ -11,7 +11,13 @@ import re
 from cStringIO import StringIO
 
 
+# Segments and contexts are created in large numbers (several per path
+# segment of every format string), so they define __slots__ to avoid carrying
+# a per-instance __dict__.
+
 class SegmentContainer(list):
+    __slots__ = ()
+
     def __str__(self):
         return repr(self)
 
@@ -26,6 +32,8 @@ class SegmentContainer(list):
 
 
 class Regex(SegmentContainer):
+    __slots__ = ()
+
     def __str__(self):
         return self.get_string().encode('utf-8')
 
@@ -42,16 +50,66 @@ class Regex(SegmentContainer):
         return re.compile(self.get_string())
 
 
-class Context(object):
-    encoding = 'utf-8'
+# Matches, in a single left-to-right pass, every token of a regular
+# expression that matters for group scanning: escape sequences (which are
+# skipped over as a whole, so escaped parentheses and escaped backslashes are
+# handled correctly) and opening parentheses, along with any "?" extension
+# marker and named group name that follows them.
+_group_token_regex = re.compile(
+  r'\\.|\((?:\?P<(?P<name>[^>]*)>|(?P<extension>\?))?', re.DOTALL)
+
+
+# Results of scan_groups, keyed by expression string.  Like the re module's
+# own cache, it is simply emptied once it grows past _MAX_SCAN_CACHE entries.
+_scan_cache = {}
+_MAX_SCAN_CACHE = 100
+
+
+def scan_groups(s):
+    '''
+    Scan regular expression string ``s`` once, and return a tuple
+    ``(number_of_groups, named_group_names)``.  Only capturing groups are
+    counted; non-capturing groups, look-around assertions and named
+    back-references are not.  Results are cached, so scanning the same
+    expression again is a dictionary lookup.
+
+    >>> scan_groups(r'()(?P<foo>bar(baz))\(x\)(?:y)(?P=foo)')
+    (3, ('foo',))
+    '''
+    try:
+        return _scan_cache[s]
+    except KeyError:
+        pass
+
+    number_of_groups = 0
+    named_group_names = []
+    for mo in _group_token_regex.finditer(s):
+        if mo.group(0).startswith('\\'):
+            continue
+        name = mo.group('name')
+        if name is not None:
+            named_group_names.append(name)
+        elif mo.group('extension'):
+            continue
+        number_of_groups = number_of_groups + 1
+
+    if len(_scan_cache) >= _MAX_SCAN_CACHE:
+        _scan_cache.clear()
+    result = (number_of_groups, tuple(named_group_names))
+    _scan_cache[s] = result
+    return result
+
 
-    named_group_start_regex = re.compile(r'(?<!\\)\(\?P\<(?P<name>.*?[^\\])\>')
-    group_start_regex = re.compile(r'(?<!\\)\((?!\?:)')
+class Context(object):
+    # _groups caches the result of scan_groups for the current value; it is
+    # reset whenever the context is written to.
+    __slots__ = ('_content', '_groups')
 
-    _content = None
+    encoding = 'utf-8'
 
     def __init__(self, initial_content = ''):
         self._content = StringIO()
+        self._groups = None
         self.write(initial_content)
 
     def __unicode__(self):
@@ -68,12 +126,18 @@ class Context(object):
             arg = ''
         return '%s(%s)' % (self.__class__.__name__, arg)
 
+    def _get_groups(self):
+        if self._groups is None:
+            self._groups = scan_groups(self.get_value())
+        return self._groups
+
     def get_named_group_names(self):
-        for mo in self.named_group_start_regex.finditer(self.get_value()):
-            yield mo.group('name')
+        number_of_groups, named_group_names = self._get_groups()
+        return iter(named_group_names)
 
     def get_number_of_groups(self):
-        return len(self.group_start_regex.findall(self.get_value()))
+        number_of_groups, named_group_names = self._get_groups()
+        return number_of_groups
 
     def add(self, segment):
         segment.eval(self)
@@ -82,18 +146,21 @@ class Context(object):
         if isinstance(s, unicode):
             s = s.encode(self.encoding)
         self._content.write(s)
+        self._groups = None
 
     def get_value(self):
         return self._content.getvalue().decode(self.encoding)
 
 
 class Segment(object):
+    __slots__ = ()
+
     def eval(self, context):
         raise NotImplementedError
 
 
 class SimpleExpression(Segment):
-    expression = None
+    __slots__ = ('expression',)
 
     def __init__(self, expression):
         self.expression = expression
@@ -103,12 +170,16 @@ class SimpleExpression(Segment):
 
 
 class CompoundSegment(Segment, SegmentContainer):
+    __slots__ = ()
+
     def eval(self, context):
         for segment in self:
             context.add(segment)
 
 
 class Group(CompoundSegment):
+    __slots__ = ()
+
     def eval(self, context):
         context.write('(')
         super(Group, self).eval(context)
@@ -116,7 +187,7 @@ class Group(CompoundSegment):
 
 
 class NamedGroup(CompoundSegment):
-    name = None
+    __slots__ = ('name',)
 
     def __init__(self, name, *args):
         self.name = name
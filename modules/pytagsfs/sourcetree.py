@@ -9,6 +9,11 @@
 
 import os, errno
 
+try:
+    from scandir import scandir
+except ImportError:
+    scandir = None
+
 from pytagsfs.util import unicode_path_sep
 from pytagsfs.debug import (
   log_debug,
@@ -58,31 +63,42 @@ class SourceTree(object):
         )
         return abs_path
 
-    def walk(self, path = None):
-        if path is None:
-            path = self.root
-
-        # os.walk seems to want encoded input
-        path = self.encode(path)
-
-        token_exchange.release_token()
-        try:
-            iterator = os.walk(path)
-        finally:
-            token_exchange.reacquire_token()
-        while True:
-            token_exchange.release_token()
-            try:
-                try:
-                    dirpath, dirnames, filenames = iterator.next()
-                except StopIteration:
-                    break
-            finally:
-                token_exchange.reacquire_token()
-            dirpath = self.decode(dirpath)
-            dirnames = [self.decode(dirname) for dirname in dirnames]
-            filenames = [self.decode(filename) for filename in filenames]
-            yield (dirpath, dirnames, filenames)
+    @token_exchange.token_released
+    def listdir(self, path):
+        '''
+        Return a tuple ``(dirnames, filenames, symlinknames)`` listing the
+        entries of directory ``path``.  Directories (including symlinks to
+        directories, as for ``os.walk``) are listed in ``dirnames``, other
+        symlinks in ``symlinknames`` and everything else in ``filenames``.
+
+        If the scandir module is available, entry types are read from the
+        directory listing itself, so that no per-entry stat call is needed on
+        file systems that report them.
+        '''
+        encoded_path = self.encode(path)
+        dirnames = []
+        filenames = []
+        symlinknames = []
+
+        if scandir is None:
+            for name in os.listdir(encoded_path):
+                full_path = os.path.join(encoded_path, name)
+                if os.path.isdir(full_path):
+                    dirnames.append(self.decode(name))
+                elif os.path.islink(full_path):
+                    symlinknames.append(self.decode(name))
+                else:
+                    filenames.append(self.decode(name))
+        else:
+            for entry in scandir(encoded_path):
+                if entry.is_dir():
+                    dirnames.append(self.decode(entry.name))
+                elif entry.is_symlink():
+                    symlinknames.append(self.decode(entry.name))
+                else:
+                    filenames.append(self.decode(entry.name))
+
+        return dirnames, filenames, symlinknames
 
     def decode(self, path):
         try:
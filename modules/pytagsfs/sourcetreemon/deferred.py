@@ -7,6 +7,8 @@
 #
 # A copy of the license has been included in the COPYING file.
 
+from collections import deque
+
 from pytagsfs.sourcetreemon import SourceTreeMonitor
 
 
@@ -24,7 +26,7 @@ class DeferredSourceTreeMonitor(SourceTreeMonitor):
 
     def __init__(self):
         super(DeferredSourceTreeMonitor, self).__init__()
-        self.event_queue = []
+        self.event_queue = deque()
 
     def set_add_cb(self, add_cb):
         self.orig_add_cb = add_cb
@@ -64,7 +66,7 @@ class DeferredSourceTreeMonitor(SourceTreeMonitor):
 
     def finish_processing(self):
         while self.event_queue:
-            event = self.event_queue.pop(0)
+            event = self.event_queue.popleft()
             if event[0] == ADD:
                 self.orig_add_cb(*(event[1:]))
             elif event[0] == REMOVE:
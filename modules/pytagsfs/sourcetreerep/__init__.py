@@ -203,15 +203,27 @@ class SourceTreeRepresentation(object):
             log_traceback()
             return
 
-        for dirpath, dirnames, filenames in self.source_tree.walk(real_path):
-            if dirpath != real_path:
-                break
-            for dirname in dirnames:
-                real_path = os.path.join(dirpath, dirname)
-                self.add_source_dir(real_path)
-            for filename in filenames:
-                real_path = os.path.join(dirpath, filename)
-                self.add_source_file(real_path)
+        try:
+            dirnames, filenames, symlinknames = self.source_tree.listdir(
+              real_path)
+        except (IOError, OSError), e:
+            log_error('failed to list source directory %s: %s', real_path, e)
+            return
+
+        for dirname in dirnames:
+            self.add_source_dir(os.path.join(real_path, dirname))
+        for filename in filenames:
+            # The directory listing already told us that this is not a
+            # symlink.
+            self.add_source_file(
+              os.path.join(real_path, filename),
+              is_symlink = False,
+            )
+        for symlinkname in symlinknames:
+            log_debug(
+              u'add_source_dir: not adding symlink: %s',
+              os.path.join(real_path, symlinkname),
+            )
 
     def remove_source_dir(self, real_path):
         '''
@@ -221,7 +233,8 @@ class SourceTreeRepresentation(object):
          * ``real_path`` was never added to the source tree representation.
         '''
         # We remove source files only because any subdirectories should already
-        # have been removed.
+        # have been removed.  Note that we need a list here, rather than
+        # iter_real_subpaths, since removing files modifies the path store.
         for real_subpath in self.path_store.get_real_subpaths(real_path):
             self.remove_source_file(real_subpath)
 
@@ -234,13 +247,17 @@ class SourceTreeRepresentation(object):
             log_traceback()
             return
 
-    def add_source_file(self, real_path):
+    def add_source_file(self, real_path, is_symlink = None):
         '''
         Add source file ``real_path`` to the source tree representation.  Do
         nothing if:
 
          * The file does not exist.
          * The target file is a directory.
+
+        If the caller already knows whether ``real_path`` is a symlink (from a
+        directory listing, for instance), it can pass ``is_symlink`` to avoid
+        checking again.
         '''
 
         # We want to filter out unreadable files and symlinks.  These checks
@@ -269,7 +286,10 @@ class SourceTreeRepresentation(object):
             )
             return
 
-        if self.source_tree.issymlink(real_path):
+        if is_symlink is None:
+            is_symlink = self.source_tree.issymlink(real_path)
+
+        if is_symlink:
             log_debug(
               u'add_source_file: not adding symlink: %s',
               real_path,
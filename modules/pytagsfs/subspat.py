@@ -157,8 +157,10 @@ class SectionNode(Node):
         return regex
 
     def get_splitter(self, substitutions):
-        regex = self.get_split_regex(substitutions)
-        return Splitter(regex.get_regex(), regex.get_string())
+        # Render the regex tree once and compile the result, rather than
+        # rendering it separately for the compiled regex and its string.
+        regex_string = self.get_split_regex(substitutions).get_string()
+        return Splitter(re.compile(regex_string), regex_string)
 
     def iter_child_nodes_recursive(self, nodes = None):
         if nodes is None:
@@ -53,18 +53,18 @@ def last_unique(iter):
     a list rather than an iterator object.
 
     Given a list l, last_unique(l) is functionally equivalent to
-    list(reversed(list(unique(reversed(l))))).
+    list(reversed(list(unique(reversed(l))))).  Items must be hashable.
 
     >>> last_unique([1, 2, 5, 4, 5, 2, 3, 6, 2])
     [1, 4, 5, 3, 6, 2]
     '''
+    seen = {}
     result = []
-    for item in iter:
-        try:
-            result.remove(item)
-        except ValueError:
-            pass
-        result.append(item)
+    for item in reversed(list(iter)):
+        if item not in seen:
+            seen[item] = True
+            result.append(item)
+    result.reverse()
     return result
 
 
@@ -38,18 +38,18 @@ class Values(dict):
 
     @classmethod
     def combine(cls, list_of_values):
-        merged = cls()
+        # Collect into a plain dict first; Values.__setitem__ copies its
+        # argument, so each key should only go through it once.
+        merged = {}
         for values in list_of_values:
             for k, value in values.items():
-                if k in merged:
-                    merged[k].extend(value)
-                else:
-                    merged[k] = list(value)
+                merged.setdefault(k, []).extend(value)
 
+        combined = cls()
         for k, l in merged.items():
-            merged[k] = list(unique(merged[k]))
+            combined[k] = unique(l)
 
-        return merged
+        return combined
 
     @classmethod
     def diff2(cls, old, new):
@@ -76,17 +76,20 @@ class Values(dict):
             if k not in base:
                 merged[k] = list(difference[k])
             else:
-                base_values = list(base[k])
-                old_values = list(old[k])
-                difference_values = list(difference[k])
-
-                merged_values = list(base_values)
-                for old_value in old_values:
-                    try:
-                        merged_values.remove(old_value)
-                    except ValueError:
-                        pass
-                merged_values.extend(difference_values)
+                # Drop the first occurrence in base of each old value, as
+                # repeated list.remove calls would, but in a single pass.
+                remove_counts = {}
+                for old_value in old[k]:
+                    remove_counts[old_value] = (
+                      remove_counts.get(old_value, 0) + 1)
+
+                merged_values = []
+                for base_value in base[k]:
+                    if remove_counts.get(base_value, 0):
+                        remove_counts[base_value] -= 1
+                    else:
+                        merged_values.append(base_value)
+                merged_values.extend(difference[k])
 
                 merged[k] = merged_values
 
@@ -30,7 +30,19 @@ PLATFORM = platform.system()
 
 TEST_DIR = os.path.abspath(os.path.dirname(__file__))
 DATA_DIR = os.path.abspath(os.path.join(TEST_DIR, 'data'))
-TEST_DATA_DIR = os.path.abspath(os.path.join(TEST_DIR, 'test-data'))
+
+# Scratch space for tests that create real files.  PYTAGSFS_TEST_DATA_DIR can
+# name a base directory on a RAM-backed filesystem (e.g. /dev/shm) to keep the
+# many small file operations the tests perform off of the disk.  The tests
+# always work in a fixed-name subdirectory of it, so that cleaning up can never
+# touch anything the tests did not create.
+if os.environ.get('PYTAGSFS_TEST_DATA_DIR'):
+    TEST_DATA_DIR = os.path.abspath(os.path.join(
+      os.environ['PYTAGSFS_TEST_DATA_DIR'],
+      'pytagsfs-test-data',
+    ))
+else:
+    TEST_DATA_DIR = os.path.join(TEST_DIR, 'test-data')
 
 
 class _UnicodePathsMixin(object):
@@ -76,6 +88,19 @@ class TestCase(_TestCase):
               repr(candidate), repr(collection)))
 
 
+def write_file(
+  filename, content, flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC):
+    # Unbuffered I/O: no file object to set up, and nothing at all is written
+    # for empty files, which most tests create.  Monitor tests also rely on
+    # small contents going out in a single write.
+    fd = os.open(filename, flags, 0666)
+    try:
+        while content:
+            content = content[os.write(fd, content):]
+    finally:
+        os.close(fd)
+
+
 class TestThatUsesRealFiles(TestCase):
     def _create_file(self, filename, content = ''):
         self._set_file_content(filename, content)
@@ -83,18 +108,21 @@ class TestThatUsesRealFiles(TestCase):
     def _set_file_content(self, filename, content):
         if isinstance(content, unicode):
             content = content.encode('utf-8')
-        f = open(filename, 'w')
-        try:
-            f.write(content)
-        finally:
-            f.close()
+        write_file(filename, content)
 
     def _get_file_content(self, filename):
-        f = open(filename, 'r')
+        fd = os.open(filename, os.O_RDONLY)
         try:
-            return f.read().decode('utf-8')
+            chunks = []
+            size = max(os.fstat(fd).st_size, 1)
+            while True:
+                chunk = os.read(fd, size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
         finally:
-            f.close()
+            os.close(fd)
+        return ''.join(chunks).decode('utf-8')
 
     def _create_files(self, filenames, contents = None):
         if contents is None:
@@ -113,7 +141,8 @@ class TestThatUsesRealFiles(TestCase):
         os.mkdir(dirname)
 
     def _create_dirs(self, dirnames):
-        for dirname in dirnames:
+        # Sorting puts each parent before its children.
+        for dirname in sorted(dirnames):
             self._create_dir(dirname)
 
     def _create_dir_if_not_exists(self, dirname):
@@ -130,13 +159,6 @@ class TestThatUsesRealFiles(TestCase):
         for dirname in dirnames:
             self._remove_dir(dirname)
 
-    def _remove_dir_if_empty(self, dirname):
-        try:
-            os.rmdir(dirname)
-        except OSError, e:
-            if e.errno != errno.ENOTEMPTY:
-                raise
-
     def assertFileExists(self, filename, mode = 'r'):
         try:
             f = open(filename, mode)
@@ -212,22 +234,34 @@ class TestThatUsesRealFiles(TestCase):
         self.assertRaises((IOError, OSError), test_fn)
 
 
+def remove_test_data_dir_if_empty():
+    # Called once, when the test run exits; see TestManager.run.
+    try:
+        os.rmdir(TEST_DATA_DIR)
+    except OSError:
+        # Missing, or not empty (left behind by a failed test).
+        pass
+
+
 class TestWithDir(TestThatUsesRealFiles):
     test_dir = None
     test_dir_prefix = None
 
     def setUp(self):
         self._create_dir_if_not_exists(TEST_DATA_DIR)
-        self.test_dir = self._get_next_test_dir()
-        os.mkdir(self.test_dir)
+        self.test_dir = self._create_next_test_dir()
 
     def tearDown(self):
+        # TEST_DATA_DIR itself is left in place for the next test, rather than
+        # being removed and re-created every time; see
+        # remove_test_data_dir_if_empty.
         self._remove_dir(self.test_dir)
-        self._remove_dir_if_empty(TEST_DATA_DIR)
 
-    def _get_next_test_dir(self):
+    def _create_next_test_dir(self):
+        # Number past any directories left behind by failed tests, so that
+        # the numbers keep showing the order tests ran in.  If another run
+        # takes the name first, keep counting up from there.
         num = 1
-
         existing_test_dirs = glob.glob(os.path.join(
           TEST_DATA_DIR,
           '%s-[0-9][0-9][0-9]' % self.test_dir_prefix,
@@ -235,7 +269,17 @@ class TestWithDir(TestThatUsesRealFiles):
         existing_test_dirs.sort()
         if existing_test_dirs != []:
             num = int(existing_test_dirs[-1][-3:]) + 1
-        return unicode(os.path.join(
-          TEST_DATA_DIR,
-          '%s-%03u' % (self.test_dir_prefix, num),
-        ))
+
+        while True:
+            test_dir = unicode(os.path.join(
+              TEST_DATA_DIR,
+              '%s-%03u' % (self.test_dir_prefix, num),
+            ))
+            try:
+                os.mkdir(test_dir)
+            except OSError, e:
+                if e.errno != errno.EEXIST:
+                    raise
+                num += 1
+            else:
+                return test_dir
@@ -7,7 +7,7 @@
 #
 # A copy of the license has been included in the COPYING file.
 
-import os, sys, glob, inspect
+import os, sys, glob, inspect, atexit
 from doctest import DocTestCase, DocTestFinder, DocTestParser
 from unittest import TestSuite, TextTestRunner, TestLoader
 
@@ -77,6 +77,11 @@ class TestManager(object):
         try:
             self.load()
 
+            # Tests leave TEST_DATA_DIR in place for each other; remove it
+            # once the whole run is over.
+            from common import remove_test_data_dir_if_empty
+            atexit.register(remove_test_data_dir_if_empty)
+
             suite = TestSuite()
             runner = TextTestRunner(verbosity = 2)
 
@@ -28,10 +28,20 @@ from manager import manager
 class _PathStoreTestCase(TestCase):
     path_store_class = None
 
+    # Shared by all test cases; maps each path literal to its unicode form.
+    _p_cache = {}
+
     def p(self, s):
-        if not isinstance(s, unicode):
-            s = unicode(s)
-        return s
+        try:
+            return self._p_cache[s]
+        except KeyError:
+            pass
+        if isinstance(s, unicode):
+            u = s
+        else:
+            u = unicode(s)
+        self._p_cache[s] = u
+        return u
 
     def test_add_file_end_point_flat(self):
         store = self.path_store_class()
@@ -327,6 +337,38 @@ class _PathStoreTestCase(TestCase):
           [self.p('/foo/bar/baz'), self.p('/foo/bar/qux')],
         )
 
+    def test_iter_real_subpaths(self):
+        store = self.path_store_class()
+        store.add_file(self.p('/klink'), self.p('/foo/bar/baz'))
+        store.add_file(self.p('/klank'), self.p('/foo/bar/qux'))
+        store.add_file(self.p('/klonk'), self.p('/foobar'))
+        real_subpaths = list(store.iter_real_subpaths(self.p('/foo')))
+        real_subpaths.sort()
+        self.assertEqual(
+          real_subpaths,
+          [self.p('/foo/bar/baz'), self.p('/foo/bar/qux')],
+        )
+
+    def test_get_end_points(self):
+        store = self.path_store_class()
+        store.add_file(self.p('/foo/bar/baz'), self.p('/klink'))
+        store.add_directory(self.p('/foo/qux'))
+        store.add_file(self.p('/foo/bar/bink'), self.p('/klank'))
+        store.add_file(self.p('/bonk'), self.p('/klonk'))
+        self.assertEqual(
+          store.get_end_points(self.p('/')),
+          [
+            self.p('/foo/qux'),
+            self.p('/foo/bar/baz'),
+            self.p('/foo/bar/bink'),
+            self.p('/bonk'),
+          ],
+        )
+        self.assertEqual(
+          store.get_end_points(self.p('/foo/bar/baz')),
+          [self.p('/foo/bar/baz')],
+        )
+
     def test_meta_data_with_file_end_point(self):
         store = self.path_store_class()
         a = {1: 2, 3: 4}
@@ -7,9 +7,11 @@
 #
 # A copy of the license has been included in the COPYING file.
 
+from unittest import TestCase
+
 from manager import manager
 
-from pytagsfs.pathstore.pytypes import PyTypesPathStore
+from pytagsfs.pathstore.pytypes import PyTypesPathStore, EntryStore
 
 from pathstore import _PathStoreTestCase
 from common import _UnicodePathsMixin
@@ -27,4 +29,29 @@ class PyTypesPathStoreUnicodeTestCase(_UnicodePathsMixin, _PathStoreTestCase):
 manager.add_test_case_class(PyTypesPathStoreUnicodeTestCase)
 
 
+class EntryStoreTestCase(TestCase):
+    def test_iter_directories_and_entries_recursive(self):
+        self.assertEqual(
+          list(EntryStore().iter_directories_and_entries_recursive(
+            u'/foo/bar/baz')),
+          [(u'/', u'foo'), (u'/foo', u'bar'), (u'/foo/bar', u'baz')],
+        )
+
+    def test_iter_directories_and_entries_recursive_with_relative_path(self):
+        self.assertRaises(
+          ValueError,
+          list,
+          EntryStore().iter_directories_and_entries_recursive(u'foo'),
+        )
+
+    def test_iter_directories_and_entries_recursive_with_trailing_sep(self):
+        self.assertRaises(
+          ValueError,
+          list,
+          EntryStore().iter_directories_and_entries_recursive(u'/foo/'),
+        )
+
+manager.add_test_case_class(EntryStoreTestCase)
+
+
 manager.add_doc_test_cases_from_module(__name__, 'pytagsfs.pathstore.pytypes')
@@ -102,6 +102,19 @@ class ContextTestCase(TestCase):
           3,
         )
 
+    def test_get_named_group_names_after_write(self):
+        context = Context(r'(?P<foo>bar)')
+        self.assertEqual(list(context.get_named_group_names()), ['foo'])
+        context.write(r'(?P<baz>qux)')
+        self.assertEqual(list(context.get_named_group_names()), ['foo', 'baz'])
+        self.assertEqual(context.get_number_of_groups(), 2)
+
+    def test_get_number_of_groups_with_non_capturing_groups(self):
+        self.assertEqual(
+          Context(r'\\(a)(?:b)(?=c)(?P<foo>d)(?P=foo)').get_number_of_groups(),
+          2,
+        )
+
 manager.add_test_case_class(ContextTestCase)
 
 
@@ -137,3 +150,6 @@ class NamedGroupTestCase(TestCase):
           regex.get_string(), '(?P<foo>bar)(?P<bink>bonk)(?P=foo)')
 
 manager.add_test_case_class(NamedGroupTestCase)
+
+
+manager.add_doc_test_cases_from_module(__name__, 'pytagsfs.regex')
@@ -14,22 +14,30 @@ from pytagsfs.sourcetree import SourceTree
 from pytagsfs.util import unicode_path_sep
 
 from manager import manager
+from common import TestWithDir
 
 
 class SourceTreeTestCase(TestCase):
     root = os.path.join(unicode_path_sep, u'foo', u'bar')
 
+    # These do not depend on root, so they are built once for all tests.
+    relative_path = os.path.join(unicode_path_sep, u'a')
+    relative_path_with_trailing_sep = os.path.join(unicode_path_sep, u'a', u'')
+
+    # Paths must begin with a slash, and must not end with one.
+    invalid_paths = (u'a', relative_path_with_trailing_sep)
+
     def setUp(self):
         self.source_tree = SourceTree(self.root)
+        self.absolute_path = os.path.join(self.root, u'a')
 
     def tearDown(self):
         del self.source_tree
 
     def test_get_relative_path(self):
         self.assertEqual(
-          self.source_tree.get_relative_path(
-            os.path.join(self.root, u'a')),
-          os.path.join(unicode_path_sep, u'a'),
+          self.source_tree.get_relative_path(self.absolute_path),
+          self.relative_path,
         )
 
         self.assertEqual(
@@ -37,27 +45,14 @@ class SourceTreeTestCase(TestCase):
           unicode_path_sep,
         )
 
-        # Paths must begin with a slash.
-        self.assertRaises(
-          ValueError,
-          self.source_tree.get_relative_path,
-          u'a',
-        )
-
-        # Paths must not end with a slash.
-        path = os.path.join(unicode_path_sep, u'a', u'')
-        self.assertTrue(path.endswith(unicode_path_sep))
-        self.assertRaises(
-          ValueError,
-          self.source_tree.get_relative_path,
-          path,
-        )
+        for path in self.invalid_paths:
+            self.assertRaises(
+              ValueError, self.source_tree.get_relative_path, path)
 
     def test_get_absolute_path(self):
         self.assertEqual(
-          self.source_tree.get_absolute_path(
-            os.path.join(unicode_path_sep, u'a')),
-          os.path.join(self.root, u'a'),
+          self.source_tree.get_absolute_path(self.relative_path),
+          self.absolute_path,
         )
 
         self.assertEqual(
@@ -65,21 +60,9 @@ class SourceTreeTestCase(TestCase):
           self.root,
         )
 
-        # Paths must begin with a slash.
-        self.assertRaises(
-          ValueError,
-          self.source_tree.get_absolute_path,
-          u'a',
-        )
-
-        # Paths must not end with a slash.
-        path = os.path.join(unicode_path_sep, u'a', u'')
-        self.assertTrue(path.endswith(unicode_path_sep))
-        self.assertRaises(
-          ValueError,
-          self.source_tree.get_absolute_path,
-          path,
-        )
+        for path in self.invalid_paths:
+            self.assertRaises(
+              ValueError, self.source_tree.get_absolute_path, path)
 
 
 manager.add_test_case_class(SourceTreeTestCase)
@@ -89,3 +72,33 @@ class RootSourceTreeTestCase(SourceTreeTestCase):
     root = unicode_path_sep
 
 manager.add_test_case_class(RootSourceTreeTestCase)
+
+
+class SourceTreeListdirTestCase(TestWithDir):
+    test_dir_prefix = 'sourcetree'
+
+    def setUp(self):
+        super(SourceTreeListdirTestCase, self).setUp()
+        self.source_tree = SourceTree(self.test_dir)
+        self._create_dir(os.path.join(self.test_dir, u'a'))
+        self._create_file(os.path.join(self.test_dir, u'b'))
+        os.symlink(u'a', os.path.join(self.test_dir, u'c'))
+        os.symlink(u'b', os.path.join(self.test_dir, u'd'))
+
+    def tearDown(self):
+        os.unlink(os.path.join(self.test_dir, u'd'))
+        os.unlink(os.path.join(self.test_dir, u'c'))
+        self._remove_file(os.path.join(self.test_dir, u'b'))
+        self._remove_dir(os.path.join(self.test_dir, u'a'))
+        del self.source_tree
+        super(SourceTreeListdirTestCase, self).tearDown()
+
+    def test_listdir(self):
+        dirnames, filenames, symlinknames = self.source_tree.listdir(
+          self.test_dir)
+        dirnames.sort()
+        self.assertEqual(dirnames, [u'a', u'c'])
+        self.assertEqual(filenames, [u'b'])
+        self.assertEqual(symlinknames, [u'd'])
+
+manager.add_test_case_class(SourceTreeListdirTestCase)
@@ -7,7 +7,8 @@
 #
 # A copy of the license has been included in the COPYING file.
 
-import os, time, stat
+import os, sys, time, stat, select
+from collections import deque
 
 from pytagsfs.exceptions import (
   NotADirectory,
@@ -36,7 +37,9 @@ from common import (
   NO_GAMIN_PLATFORMS,
   NO_KQUEUE_PLATFORMS,
   TEST_DATA_DIR,
+  TestCase,
   TestWithDir,
+  write_file,
 )
 from manager import manager
 
@@ -46,6 +49,42 @@ REMOVE = 'REMOVE'
 UPDATE = 'UPDATE'
 
 
+def backend_is_available(name, unsupported_platforms):
+    '''
+    Return True if the monitor tests for backend module ``name`` should be
+    registered on this platform.
+
+    The monitor classes only import their backend module when instantiated,
+    so it is checked for up front rather than letting every test in the case
+    error out with MissingDependency.  If the backend is expected on this
+    platform but cannot be imported, a single failing test case is registered
+    in place of the real ones, so that a run cannot pass without monitor
+    coverage.
+    '''
+    if PLATFORM in unsupported_platforms:
+        return False
+
+    try:
+        __import__(name)
+    except ImportError, e:
+        message = '%s is expected on %s but cannot be imported: %s' % (
+          name, PLATFORM, e)
+        print >>sys.stderr, 'warning: skipping %s monitor tests: %s' % (
+          name, message)
+
+        def test_backend_is_available(self):
+            self.fail(message)
+
+        manager.add_test_case_class(type(
+          '%sBackendMissingTestCase' % name.capitalize(),
+          (TestCase,),
+          {'test_backend_is_available': test_backend_is_available},
+        ))
+        return False
+
+    return True
+
+
 class StopLooking(Exception):
     pass
 
@@ -56,10 +95,31 @@ class _SourceTreeMonitorTestCase(TestWithDir):
     sourcetreemoncls = None
     sets_is_dir = False
 
+    # Seconds to allow for watches to take effect after add_source_dir
+    # returns.  inotify and kqueue register watches synchronously, so no
+    # delay is needed for them; gamin talks to a separate server process.
+    watch_setup_delay = 0
+
+    # Bounds, in seconds, on each wait for the monitor between sweeps.  The
+    # wait returns early when the monitor's fd becomes readable; the timeout
+    # starts short and doubles, so that monitors without a usable fd (or that
+    # produce events without one) are re-checked quickly at first.
+    initial_backoff = 0.01
+    max_backoff = 0.5
+
+    # Whether the monitor's fd may be waited on with poll(); otherwise
+    # select() is used.
+    monitor_fd_supports_poll = True
+
     def setUp(self):
         super(_SourceTreeMonitorTestCase, self).setUp()
 
-        self.events = []
+        # Paths used by most tests, joined once.
+        self.foo_path = os.path.join(self.test_dir, 'foo')
+        self.bar_path = os.path.join(self.test_dir, 'bar')
+
+        self.events = deque()
+        self.added_dirs = set()
         self.stm = self.sourcetreemoncls()
 
         self.stm.set_add_cb(self.add_cb)
@@ -68,9 +128,9 @@ class _SourceTreeMonitorTestCase(TestWithDir):
 
         self.stm.start()
         self.stm.add_source_dir(self.test_dir)
+        self.waitForWatches()
 
-        # FIXME: Is this necessary?
-        time.sleep(2)
+        self.setUpPoller()
 
     def tearDown(self):
         self.stm.stop()
@@ -80,23 +140,44 @@ class _SourceTreeMonitorTestCase(TestWithDir):
     def add_cb(self, path, is_dir = None):
         self.events.append((ADD, path, is_dir))
 
-        try:
-            names = os.listdir(path)
-        except (IOError, OSError):
-            names = []
+        # Recursing into children below means that a directory may be
+        # reported more than once; only watch and scan it the first time.
+        # Repeat ADDs for files are always passed on to the monitor, as
+        # SourceTreeRepresentation does: a file replaced by rename is
+        # reported as an ADD with no REMOVE.
+        if path in self.added_dirs:
+            return
+
+        # Files have no entries to scan; don't bother asking the kernel.
+        names = []
+        if is_dir is not False:
+            try:
+                names = os.listdir(path)
+            except (IOError, OSError):
+                pass
 
         try:
             if is_dir is None:
                 try:
                     self.stm.add_source_dir(path)
                 except NotADirectory:
+                    is_dir = False
                     self.stm.add_source_file(path)
+                else:
+                    is_dir = True
             elif is_dir:
                 self.stm.add_source_dir(path)
             else:
                 self.stm.add_source_file(path)
         except WatchExistsError:
-            pass
+            # The type is still unknown if add_source_dir refused the path
+            # because it is already watched, whether as a directory or as a
+            # file.  Look, so that a directory is still recorded.
+            if is_dir is None:
+                is_dir = os.path.isdir(path)
+
+        if is_dir:
+            self.added_dirs.add(path)
 
         for name in names:
             self.stm.add_cb(os.path.join(path, name))
@@ -104,6 +185,11 @@ class _SourceTreeMonitorTestCase(TestWithDir):
     def remove_cb(self, path, is_dir = None):
         self.events.append((REMOVE, path, is_dir))
 
+        prefix = path + os.sep
+        for added_dir in list(self.added_dirs):
+            if added_dir == path or added_dir.startswith(prefix):
+                self.added_dirs.remove(added_dir)
+
         if is_dir is None:
             try:
                 self.stm.remove_source_dir(path)
@@ -117,51 +203,102 @@ class _SourceTreeMonitorTestCase(TestWithDir):
     def update_cb(self, path, is_dir = None):
         self.events.append((UPDATE, path, is_dir))
 
+    def waitForWatches(self):
+        if self.watch_setup_delay:
+            time.sleep(self.watch_setup_delay)
+
+    def setUpPoller(self):
+        # Register the monitor's fd once per test, rather than handing it to
+        # select on every wait.  process_events always drains the monitor, so
+        # level-triggered readiness is all we need.
+        self.monitor_fd = None
+        self.poller = None
+
+        try:
+            self.monitor_fd = self.stm.fileno()
+        except NotImplementedError:
+            return
+
+        if self.monitor_fd_supports_poll and hasattr(select, 'poll'):
+            self.poller = select.poll()
+            self.poller.register(self.monitor_fd, select.POLLIN)
+
+    def waitForMonitor(self, timeout):
+        # Block until the monitor has something to read or timeout seconds
+        # elapse, whichever comes first.
+        if self.poller is not None:
+            self.poller.poll(int(timeout * 1000))
+        elif self.monitor_fd is not None:
+            select.select([self.monitor_fd], [], [], timeout)
+        else:
+            time.sleep(timeout)
+
     def clearEvents(self):
-        while self.events:
-            self.events.pop()
+        self.events.clear()
 
     def waitForEvents(self, *expected_events, **kwargs):
-        expected_events = list(expected_events)
-
         expect_is_dir = kwargs.get('expect_is_dir', True)
+        compare_is_dir = expect_is_dir and self.sets_is_dir
+
+        # Index expected events by (type, path) so that each received event
+        # is matched with a single lookup.
+        expected = {}
+        for expected_event in expected_events:
+            expected.setdefault(expected_event[0:2], []).append(expected_event)
+
+        deadline = time.time() + 10
+        backoff = self.initial_backoff
 
         try:
-            for count in range(10):
+            while True:
                 self.clearEvents()
 
                 self.stm.process_events()
 
                 for event in self.events:
-                    for expected_event in expected_events:
-                        if expect_is_dir and self.sets_is_dir:
-                            if event == expected_event:
-                                expected_events.remove(expected_event)
-                                if not expected_events:
-                                    raise StopLooking
-                        else:
-                            if event[0:2] == expected_event[0:2]:
-                                expected_events.remove(expected_event)
-                                if not expected_events:
-                                    raise StopLooking
-
-                time.sleep(1)
+                    key = event[0:2]
+                    try:
+                        candidates = expected[key]
+                    except KeyError:
+                        continue
+
+                    if compare_is_dir:
+                        if event not in candidates:
+                            continue
+                        candidates.remove(event)
+                    else:
+                        candidates.pop()
+
+                    if not candidates:
+                        del expected[key]
+                        if not expected:
+                            raise StopLooking
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.waitForMonitor(min(remaining, backoff))
+                backoff = min(backoff * 2, self.max_backoff)
         except StopLooking:
             pass
 
-        if expected_events:
+        if expected:
+            expected_events = []
+            for candidates in expected.values():
+                expected_events.extend(candidates)
             raise AssertionError(
               'did not receive events: %s' % str(expected_events))
 
     def writeFileContents(self, filename, contents):
-        f = open(filename, 'w')
-        try:
-            f.write(contents)
-        finally:
-            f.close()
+        # Write with a single unbuffered write, so that the monitor sees one
+        # modification rather than whatever the stdio flush pattern produces.
+        write_file(filename, contents)
+
+    def appendFileContents(self, filename, contents):
+        write_file(filename, contents, os.O_WRONLY | os.O_APPEND)
 
     def test_create_file(self):
-        test_file = os.path.join(self.test_dir, 'foo')
+        test_file = self.foo_path
 
         self.writeFileContents(test_file, 'foo\n')
 
@@ -171,7 +308,7 @@ class _SourceTreeMonitorTestCase(TestWithDir):
             os.unlink(test_file)
 
     def test_create_directory(self):
-        test_dir = os.path.join(self.test_dir, 'foo')
+        test_dir = self.foo_path
 
         os.mkdir(test_dir)
 
@@ -181,7 +318,7 @@ class _SourceTreeMonitorTestCase(TestWithDir):
             os.rmdir(test_dir)
 
     def test_remove_file(self):
-        test_file = os.path.join(self.test_dir, 'foo')
+        test_file = self.foo_path
 
         self.writeFileContents(test_file, 'foo\n')
 
@@ -195,7 +332,7 @@ class _SourceTreeMonitorTestCase(TestWithDir):
         self.waitForEvents((REMOVE, test_file, False))
 
     def test_remove_directory(self):
-        test_dir = os.path.join(self.test_dir, 'foo')
+        test_dir = self.foo_path
         os.mkdir(test_dir)
 
         try:
@@ -208,8 +345,8 @@ class _SourceTreeMonitorTestCase(TestWithDir):
         self.waitForEvents((REMOVE, test_dir, True))
 
     def test_rename_file(self):
-        test_file = os.path.join(self.test_dir, 'foo')
-        test_file_renamed = os.path.join(self.test_dir, 'bar')
+        test_file = self.foo_path
+        test_file_renamed = self.bar_path
 
         self.writeFileContents(test_file, 'foo\n')
 
@@ -230,8 +367,8 @@ class _SourceTreeMonitorTestCase(TestWithDir):
             os.unlink(test_file_renamed)
 
     def test_rename_directory(self):
-        test_dir = os.path.join(self.test_dir, 'foo')
-        test_dir_renamed = os.path.join(self.test_dir, 'bar')
+        test_dir = self.foo_path
+        test_dir_renamed = self.bar_path
 
         os.mkdir(test_dir)
 
@@ -252,7 +389,7 @@ class _SourceTreeMonitorTestCase(TestWithDir):
             os.rmdir(test_dir_renamed)
 
     def test_update_file(self):
-        test_file = os.path.join(self.test_dir, 'foo')
+        test_file = self.foo_path
 
         self.writeFileContents(test_file, 'foo\n')
 
@@ -262,11 +399,7 @@ class _SourceTreeMonitorTestCase(TestWithDir):
             os.unlink(test_file)
             raise
 
-        f = open(test_file, 'a+')
-        try:
-            f.write('bar\n')
-        finally:
-            f.close()
+        self.appendFileContents(test_file, 'bar\n')
 
         try:
             self.waitForEvents((UPDATE, test_file, False))
@@ -274,8 +407,8 @@ class _SourceTreeMonitorTestCase(TestWithDir):
             os.unlink(test_file)
 
     def test_replace_file(self):
-        test_file = os.path.join(self.test_dir, 'foo')
-        replacement_source_file = 'bar'
+        test_file = self.foo_path
+        replacement_source_file = self.bar_path
 
         self.writeFileContents(test_file, 'foo\n')
 
@@ -301,14 +434,15 @@ class _SourceTreeMonitorTestCase(TestWithDir):
             os.unlink(test_file)
 
     def test_remove_nested_directories(self):
-        test_dir_base = os.path.join(self.test_dir, 'a')
-        test_dir = os.path.join(test_dir_base, 'b', 'c', 'd', 'e', 'f')
-
+        # Build the list of nested directories from the components directly,
+        # deepest first, which is the order we expect to see them removed in.
         dirs = []
-        dir = test_dir
-        while dir != self.test_dir:
+        dir = self.test_dir
+        for name in ('a', 'b', 'c', 'd', 'e', 'f'):
+            dir = os.path.join(dir, name)
             dirs.append(dir)
-            dir = os.path.dirname(dir)
+        dirs.reverse()
+        test_dir = dirs[0]
 
         def remove_dirs():
             for dir in dirs:
@@ -324,23 +458,29 @@ class _SourceTreeMonitorTestCase(TestWithDir):
         remove_dirs()
 
         # Test that removals are received in the right order for nested
-        # directories:
+        # directories.  All of the rmdir calls have been made by now, so their
+        # events are normally collected by a single process_events sweep.
 
         removals = []
-        count = 0
+        deadline = time.time() + len(dirs) + 2
+        backoff = self.initial_backoff
 
-        while len(removals) < len(dirs):
+        while True:
             self.stm.process_events()
 
             while self.events:
-                event = self.events.pop(0)
+                event = self.events.popleft()
                 if event[0] == REMOVE:
                     removals.append(event[1])
-            time.sleep(1)
-            count = count + 1
 
-            if count > len(dirs) + 1:
+            if len(removals) >= len(dirs):
+                break
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
                 raise AssertionError('waited too long for events')
+            self.waitForMonitor(min(remaining, backoff))
+            backoff = min(backoff * 2, self.max_backoff)
 
         self._check_removals(removals, dirs)
 
@@ -348,7 +488,7 @@ class _SourceTreeMonitorTestCase(TestWithDir):
         self.assertEqual(removals, dirs)
 
 
-if PLATFORM not in NO_INOTIFY_PLATFORMS:
+if backend_is_available('inotifyx', NO_INOTIFY_PLATFORMS):
     class InotifyxSourceTreeMonitorTestCase(_SourceTreeMonitorTestCase):
         sourcetreemoncls = InotifyxSourceTreeMonitor
         sets_is_dir = True
@@ -362,41 +502,48 @@ if PLATFORM not in NO_INOTIFY_PLATFORMS:
     manager.add_test_case_class(DeferredInotifyxSourceTreeMonitorTestCase)
 
 
-if PLATFORM not in NO_GAMIN_PLATFORMS:
-    class GaminSourceTreeMonitorTestCase(_SourceTreeMonitorTestCase):
-        sourcetreemoncls = GaminSourceTreeMonitor
-        sets_is_dir = False
-
+if backend_is_available('gamin', NO_GAMIN_PLATFORMS):
+    class _GaminRemovalOrderMixin(object):
         def _check_removals(self, removals, dirs):
             # Gamin does not return these events in a reliable order.  This
             # situation is handled fine, even though it is inappropriate.  As
             # an exception, we don't fail this test if that happens.
             self.assertEqual(set(removals), set(dirs))
 
+    class GaminSourceTreeMonitorTestCase(
+      _GaminRemovalOrderMixin, _SourceTreeMonitorTestCase):
+        sourcetreemoncls = GaminSourceTreeMonitor
+        sets_is_dir = False
+        watch_setup_delay = 2
+
     manager.add_test_case_class(GaminSourceTreeMonitorTestCase)
 
-    class DeferredGaminSourceTreeMonitorTestCase(_SourceTreeMonitorTestCase):
+    class DeferredGaminSourceTreeMonitorTestCase(
+      _GaminRemovalOrderMixin, _SourceTreeMonitorTestCase):
         sourcetreemoncls = DeferredGaminSourceTreeMonitor
         sets_is_dir = False
-
-        def _check_removals(self, removals, dirs):
-            # Gamin does not return these events in a reliable order.  This
-            # situation is handled fine, even though it is inappropriate.  As
-            # an exception, we don't fail this test if that happens.
-            self.assertEqual(set(removals), set(dirs))
+        watch_setup_delay = 2
 
     manager.add_test_case_class(DeferredGaminSourceTreeMonitorTestCase)
 
 
-if PLATFORM not in NO_KQUEUE_PLATFORMS:
+if backend_is_available('kqueue', NO_KQUEUE_PLATFORMS):
     class KqueueSourceTreeMonitorTestCase(_SourceTreeMonitorTestCase):
         sourcetreemoncls = KqueueSourceTreeMonitor
         sets_is_dir = False
 
+        # kqueue(2) documents kqueue descriptors as select()able; poll() is
+        # not supported on them everywhere (notably Mac OS X).
+        monitor_fd_supports_poll = False
+
     manager.add_test_case_class(KqueueSourceTreeMonitorTestCase)
 
     class DeferredKqueueSourceTreeMonitorTestCase(_SourceTreeMonitorTestCase):
         sourcetreemoncls = DeferredKqueueSourceTreeMonitor
         sets_is_dir = False
 
+        # kqueue(2) documents kqueue descriptors as select()able; poll() is
+        # not supported on them everywhere (notably Mac OS X).
+        monitor_fd_supports_poll = False
+
     manager.add_test_case_class(DeferredKqueueSourceTreeMonitorTestCase)
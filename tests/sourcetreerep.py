@@ -71,49 +71,75 @@ class ContentMetaStore(MetaStore):
     def get(self, path):
         values = Values()
         try:
-            f = open(path, 'r')
+            f = open(path, 'rb')
             try:
-                values['c'] = values['content'] = [
-                  l.rstrip('\n').decode('utf-8') for l in f.readlines()]
+                data = f.read()
             finally:
                 f.close()
         except (OSError, IOError):
-            pass
+            return values
+
+        # Decode and split in one pass each; a trailing newline does not
+        # start another line.
+        lines = data.decode('utf-8').split(u'\n')
+        if lines[-1] == u'':
+            lines.pop()
+        values['content'] = lines
+        values['c'] = lines
         return values
 
     def set(self, path, values):
-        set_keys = []
-        for key in self.keys:
-            if key in values:
-                if key in self.keys:
-                    f = open(path, 'w')
-                    try:
-                        for line in values[key]:
-                            f.write(line.encode('utf-8'))
-                            f.write('\n')
-                    finally:
-                        f.close()
-                    set_keys.append(key)
+        set_keys = [key for key in self.keys if key in values]
+        if set_keys:
+            # c and content are aliases for the same file content, so the
+            # file only needs writing once; the last key given wins.
+            lines = values[set_keys[-1]]
+            data = u''.join([u'%s\n' % line for line in lines]).encode('utf-8')
+            f = open(path, 'wb')
+            try:
+                f.write(data)
+            finally:
+                f.close()
         return set_keys
 
 
+# SubstitutionPattern objects are not modified once parsed, so tests that use
+# the same format string components can share them.
+_substitution_patterns = {}
+
+
+def get_substitution_patterns(format_string):
+    try:
+        substitution_patterns = _substitution_patterns[format_string]
+    except KeyError:
+        substitution_patterns = tuple([
+          SubstitutionPattern(s) for s in split_path(format_string)
+        ])
+        _substitution_patterns[format_string] = substitution_patterns
+    return list(substitution_patterns)
+
+
 class _BaseSourceTreeRepresentationTestCase(TestWithDir):
     test_dir_prefix = 'str'
 
     source_tree_rep = None
 
-    def p(self, s):
-        return unicode(s)
+    # Plain unicode conversion; _UnicodePathsMixin overrides this and reaches
+    # it through super(), which works the same for a staticmethod.
+    p = staticmethod(unicode)
+
+    def _test_path(self, *parts):
+        # Plain concatenation; parts are always relative and non-empty here,
+        # so os.path.join's extra checks buy nothing.
+        return unicode_path_sep.join((self.test_dir,) + parts)
 
     def _init(self, meta_store = None, format_string = None, **kwargs):
         kwargs = dict(kwargs)
         if meta_store is not None:
             kwargs['meta_store'] = meta_store
         if format_string is not None:
-            substitution_patterns = [
-              SubstitutionPattern(s) for s in split_path(format_string)
-            ]
-            kwargs['substitution_patterns'] = substitution_patterns
+            kwargs['substitution_patterns'] = get_substitution_patterns(
+              format_string)
         self.source_tree_rep = self._create_source_tree_rep(**kwargs)
 
     def _create_source_tree_rep(self, **kwargs):
@@ -149,9 +175,14 @@ class _BaseSourceTreeRepresentationTestCase(TestWithDir):
 
 
 class _PathPropCacheMixin(object):
+    # One cache is shared by every test; prune() with no arguments empties it
+    # so nothing leaks from one test into the next.
+    _shared_cache = PathPropCache()
+
     def _create_source_tree_rep(self, **kwargs):
         kwargs = dict(kwargs)
-        kwargs['cache'] = PathPropCache()
+        self._shared_cache.prune()
+        kwargs['cache'] = self._shared_cache
         return super(_PathPropCacheMixin, self)._create_source_tree_rep(
           **kwargs)
 
@@ -167,14 +198,17 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
     def test(self):
         self._init(PathMetaStore(), u'/%p/%f')
 
+        bullet_x_fake_path = join_path_abs([u'•', u'x'])
+        a_x_fake_path = join_path_abs([u'a', u'x'])
+
         dirs = [
-          os.path.join(self.test_dir, u'a'),
-          os.path.join(self.test_dir, u'•'),
+          self._test_path(u'a'),
+          self._test_path(u'•'),
         ]
         files = [
-          os.path.join(self.test_dir, u'c'),
-          os.path.join(self.test_dir, u'a', u'b'),
-          os.path.join(self.test_dir, u'•', u'x'),
+          self._test_path(u'c'),
+          self._test_path(u'a', u'b'),
+          self._test_path(u'•', u'x'),
         ]
 
         self._create_dirs(dirs)
@@ -187,18 +221,18 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
                 try:
                     self.assertEqual(
                       self.source_tree_rep.get_real_path(
-                        os.path.join(unicode_path_sep, u'•', u'x')),
-                      os.path.join(self.test_dir, u'•', u'x'),
+                        bullet_x_fake_path),
+                      self._test_path(u'•', u'x'),
                     )
                     self.assertEqual(
                       self.source_tree_rep.get_fake_paths(
-                        os.path.join(self.test_dir, u'•/x')),
-                      [os.path.join(unicode_path_sep, u'•', u'x')],
+                        self._test_path(u'•/x')),
+                      [bullet_x_fake_path],
                     )
                     self.assertRaises(
                       PathNotFound,
                       self.source_tree_rep.get_real_path,
-                      os.path.join(unicode_path_sep, u'a', u'x'),
+                      a_x_fake_path,
                     )
 
                     # Order of entries is dependent upon the order that files
@@ -228,16 +262,16 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 
     def test_updates_to_renamed_files_in_a_renamed_directory(self):
         a_content = self.p('boing')
-        a_source_path = os.path.join(self.test_dir, u'a', u'b')
-        y_source_path = os.path.join(self.test_dir, u'x', u'y')
+        a_source_path = self._test_path(u'a', u'b')
+        y_source_path = self._test_path(u'x', u'y')
 
         meta_store = DelegateMultiMetaStore([
           ContentMetaStore(), PathMetaStore()])
 
         self._init(meta_store, u'/%p/%c')
 
-        directory_path = os.path.join(self.test_dir, u'a')
-        file_path = os.path.join(self.test_dir, u'a', u'b')
+        directory_path = self._test_path(u'a')
+        file_path = self._test_path(u'a', u'b')
 
         self._create_dir(directory_path)
 
@@ -253,7 +287,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
                       [os.path.join(u'/', u'a', a_content)],
                     )
 
-                    new_directory_path = os.path.join(self.test_dir, u'x')
+                    new_directory_path = self._test_path(u'x')
                     os.rename(directory_path, new_directory_path)
                     old_directory_path = directory_path
                     directory_path = new_directory_path
@@ -291,7 +325,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 ################################################################################
 
     def test_stat_fake_directory_with_not_found_file(self):
-        dir_path = join_path([self.test_dir, self.p(u'foo')])
+        dir_path = self._test_path(self.p(u'foo'))
         file_path = join_path([dir_path, self.p(u'bar')])
         self._create_dir(dir_path)
         try:
@@ -342,7 +376,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
     def test_populate_with_files_only(self):
         filenames = [self.p('bar'), self.p('baz')]
         file_paths = [
-          join_path([self.test_dir, filename])
+          self._test_path(filename)
           for filename in filenames
         ]
 
@@ -366,7 +400,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self._remove_files(file_paths)
 
     def test_populate_with_one_subdir(self):
-        dirname = join_path([self.test_dir, self.p('foo')])
+        dirname = self._test_path(self.p('foo'))
         filenames = [self.p('bar'), self.p('baz')]
         file_paths = [join_path([dirname, filename]) for filename in filenames]
 
@@ -394,7 +428,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self._remove_dir(dirname)
 
     def test_populate_with_multiple_subdirs(self):
-        dirname = join_path([self.test_dir, self.p('foo')])
+        dirname = self._test_path(self.p('foo'))
         bar_dirname = join_path([dirname, self.p('bar')])
         baz_dirname = join_path([dirname, self.p('baz')])
 
@@ -441,7 +475,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 
     def test_file_end_point(self):
         filename = self.p('foo')
-        real_path = join_path([self.test_dir, filename])
+        real_path = self._test_path(filename)
         self._create_file(real_path)
         try:
             self._init(PathMetaStore(), u'/%f/%f')
@@ -470,7 +504,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 
     def test_directory_mid_point(self):
         filename = self.p('foo')
-        real_path = join_path([self.test_dir, filename])
+        real_path = self._test_path(filename)
         self._create_file(real_path)
         try:
             self._init(PathMetaStore(), u'/%f/%f')
@@ -539,7 +573,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_get_fake_path_with_directory(self):
-        real_path = join_path([self.test_dir, self.p('foo')])
+        real_path = self._test_path(self.p('foo'))
         self._init(PathMetaStore(), u'/%f/%f')
         self._create_dir(real_path)
         try:
@@ -553,7 +587,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self._remove_dir(real_path)
 
     def test_add_remove_source_dir_with_files_only(self):
-        dirname = join_path([self.test_dir, self.p('foo')])
+        dirname = self._test_path(self.p('foo'))
         filenames = [self.p('bar'), self.p('baz')]
         file_paths = [join_path([dirname, filename]) for filename in filenames]
 
@@ -583,7 +617,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_add_remove_source_dir_with_subdirs(self):
-        dirname = join_path([self.test_dir, self.p('foo')])
+        dirname = self._test_path(self.p('foo'))
         bar_dirname = join_path([dirname, self.p('bar')])
         baz_dirname = join_path([dirname, self.p('baz')])
 
@@ -624,7 +658,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_add_remove_source_file(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         self._init(PathMetaStore(), u'/%f')
         self.source_tree_rep.start()
         try:
@@ -641,7 +675,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_add_source_file_nonexistent(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         self._init(PathMetaStore(), u'/%f')
         self.source_tree_rep.start()
         try:
@@ -651,7 +685,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_add_source_file_unrepresentable(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         self._init(MutagenFileMetaStore(), u'/%t')
         self.source_tree_rep.start()
         try:
@@ -665,7 +699,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_add_source_file_excluded_by_fake_path(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         content = self.p('bar')
         self._init(
           ContentMetaStore(), u'/%c',
@@ -685,7 +719,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_add_source_file_excluded_by_real_path(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         content = u'bar'
         self._init(
           ContentMetaStore(), u'/%c',
@@ -705,7 +739,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_add_remove_source_file_same_real_path_twice(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         self._init(PathMetaStore(), u'/%f')
         self.source_tree_rep.start()
         try:
@@ -725,7 +759,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_remove_source_file_nonexistent(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         self._init(PathMetaStore(), u'/%f')
         self.source_tree_rep.start()
         try:
@@ -735,7 +769,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_update_source_file_causing_path_rename(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         content = self.p('foo')
         new_content = self.p('bar')
 
@@ -759,7 +793,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 
     def test_update_source_file_causing_no_path_rename(self):
         filename = self.p('foo')
-        file_path = join_path([self.test_dir, filename])
+        file_path = self._test_path(filename)
         content = 'foo'
         new_content = 'bar'
 
@@ -782,7 +816,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self._remove_file(file_path)
 
     def test_rename_path_with_file_end_point(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         content_old = self.p('bar\n')
         content_new = self.p('baz\n')
         self._create_file(file_path, content_old)
@@ -803,12 +837,13 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self._remove_file(file_path)
 
     def test_rename_path_with_empty_directory_end_point(self):
+        foo_fake_path = join_path_abs([self.p('foo')])
         self._init(ContentMetaStore(), u'/%c/%c')
         self.source_tree_rep.start()
         try:
-            self.source_tree_rep.add_directory(join_path_abs([self.p('foo')]))
+            self.source_tree_rep.add_directory(foo_fake_path)
             self.source_tree_rep.rename_path(
-              join_path_abs([self.p('foo')]),
+              foo_fake_path,
               join_path_abs([self.p('bar')]),
             )
             self.assertEqual(
@@ -819,9 +854,11 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_rename_path_with_directory_containing_file_end_points(self):
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         content_old = self.p('klink\n')
         content_new = self.p('klank\n')
+        new_name = content_new.rstrip(u'\n')
+        new_fake_path = join_path_abs([new_name])
         self._create_file(file_path, content_old)
         self._init(
           DelegateMultiMetaStore([ContentMetaStore(), PathMetaStore()]),
@@ -831,15 +868,15 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
         try:
             self.source_tree_rep.rename_path(
               join_path_abs([content_old.rstrip(u'\n')]),
-              join_path_abs([content_new.rstrip(u'\n')]),
+              new_fake_path,
             )
             self.source_tree_rep.update_source_file(file_path)
             self.assertEqual(
               self.source_tree_rep.get_entries(u'/'),
-              [content_new.rstrip(u'\n')],
+              [new_name],
             )
             self.assertEqual(
-              self.source_tree_rep.get_entries(join_path_abs([content_new.rstrip(u'\n')])),
+              self.source_tree_rep.get_entries(new_fake_path),
               [self.p('foo')],
             )
             self.assertEqual(self._get_file_content(file_path), content_new)
@@ -860,42 +897,41 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
         finally:
             self.source_tree_rep.stop()
 
-    def test_rename_path_causing_value_change_on_first_of_two_values(self):
+    def _assert_rename_path_changes_one_of_two_values(
+      self, old_value, expected_entries):
         self._init(ContentMetaStore(), u'/%c')
-        file_path = join_path([self.test_dir, self.p('foo')])
+        file_path = self._test_path(self.p('foo'))
         self._create_file(file_path, self.p('bar\nbaz\n'))
         try:
             self.source_tree_rep.start()
-            self.source_tree_rep.rename_path(self.p('/bar'), self.p('/qux'))
-            self.source_tree_rep.update_source_file(file_path)
-            self.assertEqual(
-              self.source_tree_rep.get_entries(u'/'),
-              [self.p('baz'), self.p('qux')],
-            )
+            try:
+                self.source_tree_rep.rename_path(
+                  join_path_abs([old_value]), self.p('/qux'))
+                self.source_tree_rep.update_source_file(file_path)
+                self.assertEqual(
+                  self.source_tree_rep.get_entries(u'/'),
+                  expected_entries,
+                )
+            finally:
+                self.source_tree_rep.stop()
         finally:
             self._remove_file(file_path)
 
+    def test_rename_path_causing_value_change_on_first_of_two_values(self):
+        self._assert_rename_path_changes_one_of_two_values(
+          self.p('bar'), [self.p('baz'), self.p('qux')])
+
     def test_rename_path_causing_value_change_on_last_of_two_values(self):
-        self._init(ContentMetaStore(), u'/%c')
-        file_path = join_path([self.test_dir, self.p('foo')])
-        self._create_file(file_path, self.p('bar\nbaz\n'))
-        try:
-            self.source_tree_rep.start()
-            self.source_tree_rep.rename_path(self.p('/baz'), self.p('/qux'))
-            self.source_tree_rep.update_source_file(file_path)
-            self.assertEqual(
-              self.source_tree_rep.get_entries(u'/'),
-              [self.p('bar'), self.p('qux')],
-            )
-        finally:
-            self._remove_file(file_path)
+        self._assert_rename_path_changes_one_of_two_values(
+          self.p('baz'), [self.p('bar'), self.p('qux')])
 
     def test_add_remove_directory(self):
+        foo_fake_path = join_path_abs([self.p('foo')])
         self._init(ContentMetaStore(), u'/%c/%c')
         self.source_tree_rep.start()
         try:
-            self.source_tree_rep.add_directory(join_path_abs([self.p('foo')]))
-            self.source_tree_rep.remove_directory(join_path_abs([self.p('foo')]))
+            self.source_tree_rep.add_directory(foo_fake_path)
+            self.source_tree_rep.remove_directory(foo_fake_path)
             self.assertEqual(self.source_tree_rep.get_entries(u'/'), [])
         finally:
             self.source_tree_rep.stop()
@@ -911,31 +947,33 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
         self.assertTrue((value is True) or (value is False))
 
     def _assert_lstat_getattr_attrs_are_equal(
-      self, attr, lstat_result, getattr_result):
-        lstat_value = getattr(lstat_result, attr)
-        getattr_value = getattr(getattr_result, attr)
-        self.assertEqual(
-          lstat_value,
-          getattr_value,
-          '%s is not equal: %s != %s' % (
-            attr, lstat_value, getattr_value),
-        )
+      self, attrs, lstat_result, getattr_result):
+        for attr in attrs:
+            lstat_value = getattr(lstat_result, attr)
+            getattr_value = getattr(getattr_result, attr)
+            self.assertEqual(
+              lstat_value,
+              getattr_value,
+              '%s is not equal: %s != %s' % (
+                attr, lstat_value, getattr_value),
+            )
 
     def _assert_lstat_getattr_attrs_are_equal_plus_or_minus(
-      self, attr, lstat_result, getattr_result, n):
-        lstat_value = getattr(lstat_result, attr)
-        getattr_value = getattr(getattr_result, attr)
-        self.assertEqualPlusOrMinus(
-          lstat_value,
-          getattr_value,
-          n,
-          '%s: %s and %s are more than %s apart' % (
-            attr, lstat_value, getattr_value, n),
-        )
+      self, attrs, lstat_result, getattr_result, n):
+        for attr in attrs:
+            lstat_value = getattr(lstat_result, attr)
+            getattr_value = getattr(getattr_result, attr)
+            self.assertEqualPlusOrMinus(
+              lstat_value,
+              getattr_value,
+              n,
+              '%s: %s and %s are more than %s apart' % (
+                attr, lstat_value, getattr_value, n),
+            )
 
     def test_getattr_with_file_end_point(self):
         filename = self.p('foo')
-        real_path = join_path([self.test_dir, filename])
+        real_path = self._test_path(filename)
         self._create_file(real_path)
 
         try:
@@ -955,13 +993,18 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
                   stat.S_IMODE(getattr_result.st_mode),
                 )
                 
-                for attr in ('st_nlink', 'st_uid', 'st_gid', 'st_size'):
-                    self._assert_lstat_getattr_attrs_are_equal(
-                      attr, lstat_result, getattr_result)
+                self._assert_lstat_getattr_attrs_are_equal(
+                  ('st_nlink', 'st_uid', 'st_gid', 'st_size'),
+                  lstat_result,
+                  getattr_result,
+                )
 
-                for attr in ('st_atime', 'st_mtime', 'st_ctime'):
-                    self._assert_lstat_getattr_attrs_are_equal_plus_or_minus(
-                      attr, lstat_result, getattr_result, 2)
+                self._assert_lstat_getattr_attrs_are_equal_plus_or_minus(
+                  ('st_atime', 'st_mtime', 'st_ctime'),
+                  lstat_result,
+                  getattr_result,
+                  2,
+                )
             finally:
                 self.source_tree_rep.stop()
 
@@ -989,19 +1032,21 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
               stat.S_IMODE(getattr_result.st_mode),
             )
             
-            for attr in ('st_uid', 'st_gid'):
-                self._assert_lstat_getattr_attrs_are_equal(
-                  attr, lstat_result, getattr_result)
+            self._assert_lstat_getattr_attrs_are_equal(
+              ('st_uid', 'st_gid'), lstat_result, getattr_result)
             
-            for attr in ('st_atime', 'st_mtime', 'st_ctime'):
-                self._assert_lstat_getattr_attrs_are_equal_plus_or_minus(
-                  attr, lstat_result, getattr_result, 2)
+            self._assert_lstat_getattr_attrs_are_equal_plus_or_minus(
+              ('st_atime', 'st_mtime', 'st_ctime'),
+              lstat_result,
+              getattr_result,
+              2,
+            )
         finally:
             self.source_tree_rep.stop()
 
     def test_getattr_with_directory_mid_point(self):
         filename = self.p('foo')
-        real_path = join_path([self.test_dir, filename])
+        real_path = self._test_path(filename)
         self._create_file(real_path)
 
         try:
@@ -1011,9 +1056,11 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 
             self.source_tree_rep.start()
             try:
+                # getattr does not touch the source files, so one lstat of
+                # each serves both fake paths.
+                dir_lstat_result = os.lstat(self.test_dir)
+                file_lstat_result = os.lstat(real_path)
                 for test_path in (fake_path_parent, fake_path):
-                    dir_lstat_result = os.lstat(self.test_dir)
-                    file_lstat_result = os.lstat(real_path)
                     getattr_result = self.source_tree_rep.getattr(test_path)
 
                     self.assertTrue(isinstance(getattr_result, os.stat_result))
@@ -1033,14 +1080,16 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
                     )
                     
                     # Ownership should be the same as the source directory.
-                    for attr in ('st_uid', 'st_gid'):
-                        self._assert_lstat_getattr_attrs_are_equal(
-                          attr, dir_lstat_result, getattr_result)
+                    self._assert_lstat_getattr_attrs_are_equal(
+                      ('st_uid', 'st_gid'), dir_lstat_result, getattr_result)
                     
                     # Times should be the same as the contained file.
-                    for attr in ('st_atime', 'st_mtime', 'st_ctime'):
-                        self._assert_lstat_getattr_attrs_are_equal_plus_or_minus(
-                          attr, file_lstat_result, getattr_result, 2)
+                    self._assert_lstat_getattr_attrs_are_equal_plus_or_minus(
+                      ('st_atime', 'st_mtime', 'st_ctime'),
+                      file_lstat_result,
+                      getattr_result,
+                      2,
+                    )
             finally:
                 self.source_tree_rep.stop()
 
@@ -1059,7 +1108,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 
     def test_utime_with_file_end_point(self):
         filename = self.p('foo')
-        real_path = join_path([self.test_dir, filename])
+        real_path = self._test_path(filename)
         self._create_file(real_path)
 
         self._init(PathMetaStore(), u'/%f/%f')
@@ -1093,7 +1142,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
 
     def test_utime_with_directory_mid_point(self):
         filename = self.p('foo')
-        real_path = join_path([self.test_dir, filename])
+        real_path = self._test_path(filename)
         self._create_file(real_path)
 
         try:
@@ -1127,8 +1176,8 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
         self._init(PathMetaStore(), u'/%f')
         filename = self.p('foo')
 
-        real_path1 = join_path([self.test_dir, self.p('bar'), filename])
-        real_path2 = join_path([self.test_dir, self.p('baz'), filename])
+        real_path1 = self._test_path(self.p('bar'), filename)
+        real_path2 = self._test_path(self.p('baz'), filename)
 
         files = (real_path1, real_path2)
         dirs = [os.path.dirname(p) for p in files]
@@ -1166,8 +1215,8 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
         self._init(PathMetaStore(), u'/%f')
         filename = self.p('foo')
 
-        real_path1 = join_path([self.test_dir, self.p('bar'), filename])
-        real_path2 = join_path([self.test_dir, self.p('baz'), filename])
+        real_path1 = self._test_path(self.p('bar'), filename)
+        real_path2 = self._test_path(self.p('baz'), filename)
 
         files = (real_path1, real_path2)
         dirs = [os.path.dirname(p) for p in files]
@@ -1202,7 +1251,7 @@ class SourceTreeRepresentationTestCase(_BaseSourceTreeRepresentationTestCase):
             self.source_tree_rep.stop()
 
     def test_real_path_with_multiple_tag_values(self):
-        real_path = join_path([self.test_dir, self.p('foo')])
+        real_path = self._test_path(self.p('foo'))
         content = self.p('bar\nbaz\nqux\n')
         fake_path1 = join_path_abs([self.p('bar')])
         fake_path2 = join_path_abs([self.p('baz')])
@@ -14,14 +14,27 @@ from pytagsfs.subspat import SubstitutionPattern
 from manager import manager
 
 
+# Parsed patterns are not modified by fill or split, so every test case that
+# uses the same pattern string can share one instance.
+_patterns = {}
+
+
+def get_pattern(pattern_cls, pattern_string):
+    key = (pattern_cls, pattern_string)
+    try:
+        return _patterns[key]
+    except KeyError:
+        pass
+    pattern = pattern_cls(pattern_string)
+    _patterns[key] = pattern
+    return pattern
+
+
 class SubstitutionPatternTestMixin(object):
     pattern_cls = SubstitutionPattern
 
     def setUp(self):
-        self.pattern = self.pattern_cls(self.pattern_string)
-
-    def tearDown(self):
-        del self.pattern
+        self.pattern = get_pattern(self.pattern_cls, self.pattern_string)
 
     def test_split(self):
         splitter = self.pattern.get_splitter(self.substitution_pattern_mapping)
@@ -207,50 +220,43 @@ manager.add_test_case_class(
 
 
 class ModifiedSubstitutionPatternTestMixin(object):
-    def test_modified_fill_lower_case_input(self):
-        mapping_lower = {}
-        for k, v in self.substitution_pattern_mapping.items():
-            mapping_lower[k] = v.lower()
-
+    def _assert_fill_with_case_input(self, case_method_name):
+        mapping = dict([
+          (k, getattr(v, case_method_name)())
+          for k, v in self.substitution_pattern_mapping.items()
+        ])
         self.assertEqual(
-          self.pattern.fill(mapping_lower),
+          self.pattern.fill(mapping),
           self.substitution_pattern_filled_string,
         )
 
-    def test_modified_fill_upper_case_input(self):
-        mapping_upper = {}
-        for k, v in self.substitution_pattern_mapping.items():
-            mapping_upper[k] = v.upper()
+    def test_modified_fill_lower_case_input(self):
+        self._assert_fill_with_case_input('lower')
 
-        self.assertEqual(
-          self.pattern.fill(mapping_upper),
-          self.substitution_pattern_filled_string,
-        )
+    def test_modified_fill_upper_case_input(self):
+        self._assert_fill_with_case_input('upper')
 
     def test_modified_fill_title_case_input(self):
-        mapping_title = {}
-        for k, v in self.substitution_pattern_mapping.items():
-            mapping_title[k] = v.title()
-
-        self.assertEqual(
-          self.pattern.fill(mapping_title),
-          self.substitution_pattern_filled_string,
-        )
+        self._assert_fill_with_case_input('title')
 
     def test_modified_fill_changes_case_none(self):
-        p = self.pattern_cls('%%%s' % self.modified_fill_test_expr)
+        p = get_pattern(
+          self.pattern_cls, '%%%s' % self.modified_fill_test_expr)
         self.assertEqual(p.fill({self.modified_fill_test_key: 'foo'}), 'foo')
 
     def test_modified_fill_changes_case_upper(self):
-        p = self.pattern_cls('%%^%s' % self.modified_fill_test_expr)
+        p = get_pattern(
+          self.pattern_cls, '%%^%s' % self.modified_fill_test_expr)
         self.assertEqual(p.fill({self.modified_fill_test_key: 'foo'}), 'FOO')
 
     def test_modified_fill_changes_case_lower(self):
-        p = self.pattern_cls('%%_%s' % self.modified_fill_test_expr)
+        p = get_pattern(
+          self.pattern_cls, '%%_%s' % self.modified_fill_test_expr)
         self.assertEqual(p.fill({self.modified_fill_test_key: 'FOO'}), 'foo')
 
     def test_modified_fill_changes_case_title(self):
-        p = self.pattern_cls('%%!%s' % self.modified_fill_test_expr)
+        p = get_pattern(
+          self.pattern_cls, '%%!%s' % self.modified_fill_test_expr)
         self.assertEqual(p.fill({self.modified_fill_test_key: 'fOo'}), 'Foo')
 
 
@@ -14,32 +14,50 @@ from pytagsfs.values import Values
 from manager import manager
 
 
+# diff2, diff3 and combine only read their arguments, so these can be shared
+# between tests.
+BASE = Values({'a': [u'foo', u'bar'], 'b': [u'baz'], 'd': [u'qux']})
+OLD = Values({'a': [u'foo'], 'b': [u'baz']})
+NEW_WITH_A_REMOVED = Values({'b': [u'baz']})
+NEW_WITH_A_CHANGED = Values({'a': [u'boink'], 'b': [u'baz']})
+
+
 class TestValues(TestCase):
     def test_diff2_with_value_removal(self):
-        old = Values({'a': [u'foo'], 'b': [u'baz']})
-        new = Values({'b': [u'baz']})
-        self.assertEqual(Values.diff2(old, new), Values({'a': []}))
+        self.assertEqual(
+          Values.diff2(OLD, NEW_WITH_A_REMOVED),
+          Values({'a': []}),
+        )
 
     def test_diff3_with_partial_value_removal(self):
-        base = Values({'a': [u'foo', u'bar'], 'b': [u'baz'], 'd': [u'qux']})
-        old = Values({'a': [u'foo'], 'b': [u'baz']})
-        new = Values({'b': [u'baz']})
-        self.assertEqual(Values.diff3(base, old, new), Values({'a': [u'bar']}))
+        self.assertEqual(
+          Values.diff3(BASE, OLD, NEW_WITH_A_REMOVED),
+          Values({'a': [u'bar']}),
+        )
 
     def test_diff2_with_value_change(self):
-        old = Values({'a': [u'foo'], 'b': [u'baz']})
-        new = Values({'a': [u'boink'], 'b': [u'baz']})
-        self.assertEqual(Values.diff2(old, new), Values({'a': [u'boink']}))
+        self.assertEqual(
+          Values.diff2(OLD, NEW_WITH_A_CHANGED),
+          Values({'a': [u'boink']}),
+        )
 
     def test_diff3_with_partial_value_change(self):
-        base = Values({'a': [u'foo', u'bar'], 'b': [u'baz'], 'd': [u'qux']})
-        old = Values({'a': [u'foo'], 'b': [u'baz']})
-        new = Values({'a': [u'boink'], 'b': [u'baz']})
         self.assertEqual(
-          Values.diff3(base, old, new),
+          Values.diff3(BASE, OLD, NEW_WITH_A_CHANGED),
           Values({'a': [u'bar', u'boink']}),
         )
 
+    def test_diff3_with_duplicate_base_values(self):
+        # Each old value only accounts for one occurrence in base.
+        self.assertEqual(
+          Values.diff3(
+            Values({'a': [u'foo', u'foo', u'bar']}),
+            Values({'a': [u'foo']}),
+            Values(),
+          ),
+          Values({'a': [u'foo', u'bar']}),
+        )
+
     def test_combine(self):
         a = Values({'a': [u'foo'], 'b': [u'baz', u'bar']})
         b = Values({'b': [u'qux', u'bar', u'quxx']})